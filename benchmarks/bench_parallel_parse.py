@@ -0,0 +1,62 @@
+import os
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from jack_compiler.compilation_engine import CompilationEngine
+
+SUBROUTINE_TEMPLATE = """
+  method int run{index}(int a, int b) {{
+    var int i, sum;
+    let i = 0;
+    while (i < a) {{
+      if ((i & 1) = 0) {{
+        let sum = sum + (a * b) - i;
+      }} else {{
+        do Output.printInt(sum / (i + 1));
+      }}
+      let i = i + 1;
+    }}
+    return sum;
+  }}
+"""
+
+
+def write_large_class(path: Path, subroutine_count: int):
+    with path.open(mode="w") as jack_file:
+        jack_file.write("class Large {\n  field int count;\n")
+        for i in range(subroutine_count):
+            jack_file.write(SUBROUTINE_TEMPLATE.format(index=i))
+        jack_file.write("}\n")
+
+
+def measure(input_path: Path, output_path: Path, workers: int) -> float:
+    start = time.perf_counter()
+    with CompilationEngine(str(input_path), str(output_path)) as engine:
+        engine.compile_class(workers=workers)
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subroutines", type=int, default=5000)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir, "Large.jack")
+        write_large_class(input_path, args.subroutines)
+        print(f"{args.subroutines} subroutines, {input_path.stat().st_size} bytes, {os.cpu_count()} cpus")
+
+        expected_output = None
+        baseline = None
+        for workers in args.workers:
+            output_path = Path(temp_dir, f"Large_{workers}.xml")
+            elapsed = measure(input_path, output_path, workers)
+            output = output_path.read_text()
+            expected_output = expected_output or output
+            assert output == expected_output, "parallel output differs from sequential output"
+
+            baseline = baseline or elapsed
+            print(f"workers={workers:<3} {elapsed:8.3f}s  speedup {baseline / elapsed:5.2f}x")
@@ -0,0 +1,93 @@
+import io
+import argparse
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+from benchmarks.bench_parallel_parse import write_large_class
+from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.parse_listener import ParseListener, XmlWriter
+from jack_compiler.parse_tree import ParseTreeVisitor, TreeBuilder, walk, write_json, write_xml
+
+
+class RuleCountListener(ParseListener):
+    def __init__(self):
+        self.rule_count = 0
+
+    def start_rule(self, rule_name):
+        self.rule_count += 1
+
+
+class RuleCountVisitor(ParseTreeVisitor):
+    def __init__(self):
+        self.rule_count = 0
+
+    def generic_visit(self, node):
+        self.rule_count += 1
+        super().generic_visit(node)
+
+
+def measure_tree_memory(input_path: Path):
+    with CompilationEngine(str(input_path)) as engine:
+        token_count = len(engine._tokenizer.tokens)
+        tree_builder = TreeBuilder()
+        engine.add_listener(tree_builder)
+
+        tracemalloc.start()
+        engine.compile_class()
+        tree_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    print(f"tree: {tree_bytes} bytes for {token_count} tokens, {tree_bytes / token_count:.1f} bytes/token")
+
+
+def run_three_parses(input_path: Path) -> float:
+    start = time.perf_counter()
+    for listener in (XmlWriter(io.StringIO()), RuleCountListener()):
+        with CompilationEngine(str(input_path)) as engine:
+            engine.add_listener(listener)
+            engine.compile_class()
+
+    with CompilationEngine(str(input_path)) as engine:
+        write_json(engine.build_parse_tree(), io.StringIO())
+    return time.perf_counter() - start
+
+
+def run_shared_tree(input_path: Path) -> float:
+    start = time.perf_counter()
+    with CompilationEngine(str(input_path)) as engine:
+        tree = engine.build_parse_tree()
+
+    write_xml(tree, io.StringIO())
+    RuleCountVisitor().visit(tree)
+    write_json(tree, io.StringIO())
+    return time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subroutines", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir, "Large.jack")
+        write_large_class(input_path, args.subroutines)
+
+        measure_tree_memory(input_path)
+
+        start = time.perf_counter()
+        JackTokenizer(input_path.read_text())
+        print(f"lex only:                 {time.perf_counter() - start:8.3f}s")
+
+        separate = run_three_parses(input_path)
+        shared = run_shared_tree(input_path)
+        print(f"three separate parses:    {separate:8.3f}s")
+        print(f"one parse, three passes:  {shared:8.3f}s  ({1 - shared / separate:.0%} saved)")
+
+        with CompilationEngine(str(input_path)) as engine:
+            tree = engine.build_parse_tree()
+        start = time.perf_counter()
+        walk(tree, ParseListener())
+        print(f"tree walk only:           {time.perf_counter() - start:8.3f}s")
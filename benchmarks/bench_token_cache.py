@@ -0,0 +1,42 @@
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks.bench_parallel_parse import write_large_class
+from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.token_cache import TokenCache
+
+
+def measure(function, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--subroutines", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        input_path = Path(temp_dir, "Large.jack")
+        write_large_class(input_path, args.subroutines)
+        file_text = input_path.read_text()
+        cache = TokenCache(str(Path(temp_dir, "cache")))
+
+        tokens = JackTokenizer(file_text).tokens
+        lex_time = measure(lambda: JackTokenizer(file_text), args.repeat)
+        save_time = measure(lambda: cache.save(file_text, tokens), args.repeat)
+        load_time = measure(lambda: JackTokenizer(file_text, cache), args.repeat)
+        cache_size = cache._cache_path(file_text).stat().st_size
+
+        print(f"{len(tokens)} tokens, {len(file_text)} source bytes, {cache_size} cache bytes "
+              f"({cache_size / len(file_text):.2f}x source size)")
+        print(f"lex:          {lex_time:8.3f}s")
+        print(f"cache save:   {save_time:8.3f}s")
+        print(f"cache load:   {load_time:8.3f}s  ({lex_time / load_time:.2f}x faster than lex)")
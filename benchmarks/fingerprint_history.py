@@ -0,0 +1,53 @@
+import argparse
+import subprocess
+from typing import Optional
+
+from jack_compiler.jack_tokenizer import JackTokenizer
+
+
+def git(repo: str, *args: str) -> str:
+    return subprocess.run(["git", "-C", repo, *args], check=True, capture_output=True, text=True).stdout
+
+
+def read_blob(repo: str, revision: str, path: str) -> Optional[str]:
+    result = subprocess.run(["git", "-C", repo, "show", f"{revision}:{path}"], capture_output=True, text=True)
+    return result.stdout if result.returncode == 0 else None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Counts how many .jack edits in a git history leave the token fingerprint unchanged")
+    parser.add_argument("repo", nargs="?", default=".")
+    args = parser.parse_args()
+
+    edit_count = 0
+    skipped_count = 0
+    subroutine_count = 0
+    unchanged_subroutine_count = 0
+
+    for commit in git(args.repo, "rev-list", "--reverse", "--no-merges", "HEAD").split():
+        changed_paths = git(args.repo, "diff-tree", "--no-commit-id", "--name-only", "-r", "--root", commit).split("\n")
+        for path in changed_paths:
+            if not path.endswith(".jack"):
+                continue
+
+            old_text = read_blob(args.repo, f"{commit}^", path)
+            new_text = read_blob(args.repo, commit, path)
+            if old_text is None or new_text is None or old_text == new_text:
+                continue
+
+            old_tokenizer = JackTokenizer(old_text)
+            new_tokenizer = JackTokenizer(new_text)
+            edit_count += 1
+            if old_tokenizer.fingerprint() == new_tokenizer.fingerprint():
+                skipped_count += 1
+                continue
+
+            old_fingerprints = old_tokenizer.subroutine_fingerprints()
+            for name, fingerprint in new_tokenizer.subroutine_fingerprints().items():
+                subroutine_count += 1
+                if old_fingerprints.get(name) == fingerprint:
+                    unchanged_subroutine_count += 1
+
+    print(f"file edits: {edit_count}, skipped by fingerprint: {skipped_count}")
+    print(f"subroutines in changed files: {subroutine_count}, unchanged: {unchanged_subroutine_count}")
@@ -1,46 +1,138 @@
-import html
-from jack_compiler.jack_tokenizer import JackTokenizer, KeywordType, TokenType
+from contextlib import nullcontext
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import List, Optional, Tuple
+from jack_compiler.jack_tokenizer import JackSyntaxError, JackTokenizer, KeywordType, Token, TokenType
+from jack_compiler.parse_listener import ParseListener, XmlWriter
+from jack_compiler.parse_tree import ParseNode, TreeBuilder
+from jack_compiler.token_cache import TokenCache
 
 
 def tag(tag_name):
     def decorator(func):
         def wrapper(*args, **kwargs):
             self = args[0]
-            self._output_file.write(f"{self._get_indent()}<{tag_name}>\n")
-            self._inc_indent()
+            for listener in self._listeners:
+                listener.start_rule(tag_name)
 
             func(*args, **kwargs)
 
-            self._dec_indent()
-            self._output_file.write(f"{self._get_indent()}</{tag_name}>\n")
+            for listener in self._listeners:
+                listener.end_rule(tag_name)
 
         return wrapper
     return decorator
 
 
+class _EventRecorder(ParseListener):
+    # Records events as compact, cheaply pickled values: a rule name for a
+    # start, None for an end and the token number for a terminal.
+    def __init__(self, tokenizer: JackTokenizer, first_token_number: int):
+        self.events = []
+        self._tokenizer = tokenizer
+        self._first_token_number = first_token_number
+
+    def start_rule(self, rule_name: str):
+        self.events.append(rule_name)
+
+    def end_rule(self, rule_name: str):
+        self.events.append(None)
+
+    def terminal(self, token: Token):
+        self.events.append(self._first_token_number + self._tokenizer.current_token_number)
+
+
+_TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+
+
+def _pack_tokens(tokens: List[Token]) -> List[tuple]:
+    # Plain tuples pickle an order of magnitude faster than Token objects.
+    return [(token.type.value, token.text, token.offset) for token in tokens]
+
+
+def _compile_subroutine_chunk(
+    packed_tokens: List[tuple], first_token_number: int, outline: bool, record: bool
+) -> Optional[list]:
+    # The last token of a chunk is the one following its subroutineDecs. A
+    # chunk whose parse fails or does not end exactly on that token returns
+    # None, and the main process parses the subroutineDecs itself.
+    tokens = [
+        Token(_TOKEN_TYPES[type_value], text, offset)
+        for type_value, text, offset in packed_tokens
+    ]
+    engine = CompilationEngine.from_tokens(tokens)
+    recorder = _EventRecorder(engine._tokenizer, first_token_number)
+    if record:
+        engine.add_listener(recorder)
+
+    engine._tokenizer.advance()
+    try:
+        while engine._tokenizer.current_token_number < len(tokens) - 1:
+            engine.compile_subroutine_dec(outline)
+    except JackSyntaxError:
+        return None
+
+    if engine._tokenizer.current_token_number != len(tokens) - 1:
+        return None
+    return recorder.events
+
+
 class CompilationEngine:
-    def __init__(self, input_path: str, output_path: str):
+    # Bump whenever parsing or the output format changes so that outputs
+    # kept by the analyzer's fingerprints are rebuilt.
+    VERSION = 1
+
+    CHUNKS_PER_WORKER = 4
+    # Below this many subroutine tokens, starting and feeding worker
+    # processes costs more than parsing them here.
+    MIN_PARALLEL_TOKENS = 20000
+
+    def __init__(self, input_path: str, output_path: Optional[str] = None, token_cache: Optional[TokenCache] = None):
         with open(input_path, "r") as input_file:
             input_text = input_file.read()
-            self._tokenizer = JackTokenizer(input_text)
+            tokenizer = JackTokenizer(input_text, token_cache)
 
-        self._output_file = open(output_path, "w")
-        self._indent_width = 0
+        self._init(tokenizer, output_path)
+
+    @classmethod
+    def from_tokenizer(cls, tokenizer: JackTokenizer, output_path: Optional[str] = None) -> "CompilationEngine":
+        engine = cls.__new__(cls)
+        engine._init(tokenizer, output_path)
+        return engine
+
+    @classmethod
+    def from_tokens(cls, tokens: List[Token]) -> "CompilationEngine":
+        return cls.from_tokenizer(JackTokenizer.from_tokens(tokens))
+
+    def _init(self, tokenizer: JackTokenizer, output_path: Optional[str]):
+        self._tokenizer = tokenizer
+        self._listeners = []
+        self._output_file = None
+        if output_path is not None:
+            self._output_file = open(output_path, "w")
+            self.add_listener(XmlWriter(self._output_file))
 
     def __enter__(self):
         return self
 
     def __exit__(self, exc_type, exc_value, traceback):
-        self._output_file.close()
+        if self._output_file is not None:
+            self._output_file.close()
 
-    def _inc_indent(self):
-        self._indent_width += 2
+    def add_listener(self, listener: ParseListener):
+        self._listeners.append(listener)
 
-    def _dec_indent(self):
-        self._indent_width -= 2
+    def build_parse_tree(self, outline=False, workers=1, executor: Optional[Executor] = None) -> ParseNode:
+        tree_builder = TreeBuilder()
+        self.add_listener(tree_builder)
+        try:
+            self.compile_class(outline, workers, executor)
+        finally:
+            self._listeners.remove(tree_builder)
+
+        return tree_builder.root
 
     @tag("class")
-    def compile_class(self):
+    def compile_class(self, outline=False, workers=1, executor: Optional[Executor] = None):
         self._write_keyword()
         self._write_identifier()
         self._write_symbol()
@@ -50,15 +142,83 @@ class CompilationEngine:
                 self._tokenizer.keyword() in (KeywordType.STATIC, KeywordType.FIELD):
             self.compile_class_var_dec()
 
+        if workers > 1:
+            self._compile_subroutine_decs_parallel(outline, workers, executor)
+
         while self._tokenizer.token_type() == TokenType.KEYWORD and \
                 self._tokenizer.keyword() in (
                     KeywordType.CONSTRUCTOR, KeywordType.FUNCTION, KeywordType.METHOD):
-            self.compile_subroutine_dec()
+            self.compile_subroutine_dec(outline)
 
         self._write_symbol(advance=False)
 
+        if self._tokenizer.has_more_tokens():
+            self._tokenizer.advance()
+            self._error(f"unexpected '{self._tokenizer.symbol()}' after end of class")
+
+    def _compile_subroutine_decs_parallel(self, outline, workers, executor):
+        tokens = self._tokenizer.tokens
+        start = self._tokenizer.current_token_number
+        spans = self._tokenizer.subroutine_spans(start)
+
+        # Leave anything but a gapless run of subroutineDecs followed by more
+        # tokens to the sequential loop, which reports the syntax error.
+        if not spans or spans[0][0] != start or spans[-1][1] >= len(tokens) or \
+                any(spans[i][1] != spans[i+1][0] for i in range(len(spans)-1)):
+            return
+
+        if spans[-1][1] - spans[0][0] < CompilationEngine.MIN_PARALLEL_TOKENS:
+            return
+
+        chunks = self._split_spans(spans, workers * CompilationEngine.CHUNKS_PER_WORKER)
+        packed_chunks = [_pack_tokens(tokens[chunk_start:chunk_end+1]) for chunk_start, chunk_end in chunks]
+        # A caller compiling many files passes its own long-lived executor.
+        with nullcontext(executor) if executor else ProcessPoolExecutor(max_workers=workers) as pool:
+            chunk_events = list(pool.map(
+                _compile_subroutine_chunk, packed_chunks, [chunk_start for chunk_start, _ in chunks],
+                [outline] * len(chunks), [bool(self._listeners)] * len(chunks)))
+
+        # Nothing is replayed unless every chunk parsed cleanly; otherwise the
+        # sequential loop reparses from the first span and reports the same
+        # error a sequential run would.
+        if any(events is None for events in chunk_events):
+            return
+
+        for events in chunk_events:
+            self._replay(events)
+        self._tokenizer.current_token_number = spans[-1][1]
+
+    def _replay(self, events: list):
+        tokens = self._tokenizer.tokens
+        rule_names = []
+        for event in events:
+            if event is None:
+                rule_name = rule_names.pop()
+                for listener in self._listeners:
+                    listener.end_rule(rule_name)
+            elif isinstance(event, str):
+                rule_names.append(event)
+                for listener in self._listeners:
+                    listener.start_rule(event)
+            else:
+                for listener in self._listeners:
+                    listener.terminal(tokens[event])
+
+    def _split_spans(self, spans: List[Tuple[int, int]], chunk_count: int) -> List[Tuple[int, int]]:
+        chunk_size = (spans[-1][1] - spans[0][0]) / chunk_count
+        chunks = []
+        chunk_start = spans[0][0]
+        for _, span_end in spans:
+            if span_end - chunk_start >= chunk_size:
+                chunks.append((chunk_start, span_end))
+                chunk_start = span_end
+
+        if chunk_start != spans[-1][1]:
+            chunks.append((chunk_start, spans[-1][1]))
+        return chunks
+
     @tag("subroutineDec")
-    def compile_subroutine_dec(self):
+    def compile_subroutine_dec(self, outline=False):
         self._write_keyword(advance=False)
         self._tokenizer.advance()
 
@@ -76,7 +236,14 @@ class CompilationEngine:
         self._write_symbol(advance=False)
 
         self._tokenizer.advance()
-        self.compile_subroutine_body()
+        if outline:
+            self._expect(TokenType.SYMBOL, "symbol")
+            if self._tokenizer.symbol() != "{":
+                self._error(f"expected '{{', got '{self._tokenizer.symbol()}'")
+            self._tokenizer.skip_block()
+            self._tokenizer.advance()
+        else:
+            self.compile_subroutine_body()
 
     @tag("parameterList")
     def compile_parameter_list(self):
@@ -238,11 +405,13 @@ class CompilationEngine:
                 self._write_string_constant(advance=False)
                 self._tokenizer.advance()
             case TokenType.KEYWORD:
-                if self._tokenizer.keyword() in (
+                if self._tokenizer.keyword() not in (
                     KeywordType.TRUE, KeywordType.FALSE, KeywordType.NULL, KeywordType.THIS
                 ):
-                    self._write_keyword(advance=False)
-                    self._tokenizer.advance()
+                    self._error(f"expected term, got '{self._tokenizer.symbol()}'")
+
+                self._write_keyword(advance=False)
+                self._tokenizer.advance()
             case TokenType.IDENTFIER:
                 self._write_identifier(advance=False)
                 self._tokenizer.advance()
@@ -286,6 +455,9 @@ class CompilationEngine:
                         self._tokenizer.advance()
                         self.compile_term()
 
+                    case _:
+                        self._error(f"expected term, got '{self._tokenizer.symbol()}'")
+
     @tag("varDec")
     def compile_var_dec(self):
         self._write_keyword(advance=False)
@@ -328,37 +500,42 @@ class CompilationEngine:
     def _write_keyword(self, advance=True):
         if advance:
             self._tokenizer.advance()
-
-        self._output_file.write(
-            f"{self._get_indent()}<keyword>{self._tokenizer.keyword().value}</keyword>\n")
+        self._expect(TokenType.KEYWORD, "keyword")
+        self._emit_terminal()
 
     def _write_identifier(self, advance=True):
         if advance:
             self._tokenizer.advance()
-
-        self._output_file.write(
-            f"{self._get_indent()}<identifier>{self._tokenizer.identifier()}</identifier>\n")
+        self._expect(TokenType.IDENTFIER, "identifier")
+        self._emit_terminal()
 
     def _write_symbol(self, advance=True):
         if advance:
             self._tokenizer.advance()
-
-        self._output_file.write(
-            f"{self._get_indent()}<symbol>{html.escape(self._tokenizer.symbol())}</symbol>\n")
+        self._expect(TokenType.SYMBOL, "symbol")
+        self._emit_terminal()
 
     def _write_integer_constant(self, advance=True):
         if advance:
             self._tokenizer.advance()
-
-        self._output_file.write(
-            f"{self._get_indent()}<integerConstant>{self._tokenizer.int_val()}</integerConstant>\n")
+        self._expect(TokenType.INT_CONST, "integer constant")
+        self._tokenizer.int_val()
+        self._emit_terminal()
 
     def _write_string_constant(self, advance=True):
         if advance:
             self._tokenizer.advance()
+        self._expect(TokenType.STRING_CONST, "string constant")
+        self._emit_terminal()
+
+    def _expect(self, token_type: TokenType, description: str):
+        if self._tokenizer.token_type() != token_type:
+            self._error(f"expected {description}, got '{self._tokenizer.symbol()}'")
 
-        self._output_file.write(
-            f"{self._get_indent()}<stringConstant>{self._tokenizer.string_val()}</stringConstant>\n")
+    def _emit_terminal(self):
+        token = self._tokenizer.current_token()
+        for listener in self._listeners:
+            listener.terminal(token)
 
-    def _get_indent(self):
-        return " " * self._indent_width
+    def _error(self, message: str):
+        raise self._tokenizer.syntax_error(message)
@@ -1,24 +1,111 @@
 import html
+import sys
+import json
 import argparse
 from pathlib import Path
-from jack_compiler.jack_tokenizer import TokenType, JackTokenizer
+from typing import Optional
+from concurrent.futures import ProcessPoolExecutor
+from jack_compiler.jack_tokenizer import TokenType, JackTokenizer, JackSyntaxError
 from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_file_finder import JackFileFinder
+from jack_compiler.token_cache import TokenCache
 
 
 class JackAnalyzer:
-    def run(self, input_path_str: str, token_test: bool):
-        input_path = Path(input_path_str)
+    def __init__(
+        self,
+        workers: int = 1,
+        file_finder: Optional[JackFileFinder] = None,
+        token_cache: Optional[TokenCache] = None,
+        fingerprints_path: Optional[str] = None
+    ):
+        self._workers = workers
+        self._file_finder = file_finder or JackFileFinder()
+        self._token_cache = token_cache
+        self._fingerprints_path = Path(fingerprints_path) if fingerprints_path else None
+        self._fingerprints = {}
+        self._executor = None
+        self.skipped_count = 0
+
+    def run(self, input_path_str: str, token_test: bool, outline: bool = False, check: bool = False) -> int:
+        # One pool serves every file of the run; it only starts processes
+        # once a class is large enough to be parsed in parallel.
+        if self._workers > 1:
+            self._executor = ProcessPoolExecutor(max_workers=self._workers)
+        try:
+            return self._run(Path(input_path_str), token_test, outline, check)
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown()
+                self._executor = None
+
+    def _run(self, input_path: Path, token_test: bool, outline: bool, check: bool) -> int:
+        if check:
+            return self._run_check(input_path)
 
         if token_test:
             self._run_token_test(input_path)
         else:
-            self._run_analysis(input_path)
+            self._load_fingerprints()
+            try:
+                self._run_analysis(input_path, outline)
+            finally:
+                self._save_fingerprints()
+        return 0
+
+    def _load_fingerprints(self):
+        self._fingerprints = {}
+        if self._fingerprints_path is None or not self._fingerprints_path.is_file():
+            return
+
+        try:
+            with self._fingerprints_path.open(mode="r") as fingerprints_file:
+                self._fingerprints = json.load(fingerprints_file)
+        except (OSError, ValueError):
+            self._fingerprints = {}
+
+    def _save_fingerprints(self):
+        if self._fingerprints_path is None:
+            return
+
+        with self._fingerprints_path.open(mode="w") as fingerprints_file:
+            json.dump(self._fingerprints, fingerprints_file, indent=2, sort_keys=True)
+
+    def _run_check(self, input_path: Path) -> int:
+        if input_path.is_file():
+            jack_files = [input_path]
+        elif input_path.is_dir():
+            jack_files = self._file_finder.find(input_path)
+        else:
+            print(f"{input_path}: no such file or directory", file=sys.stderr)
+            return 1
 
-    def _run_analysis(self, input_path: Path):
+        file_count = 0
+        error_count = 0
+        for jack_file in jack_files:
+            file_count += 1
+            if not self._run_check_file(jack_file):
+                error_count += 1
+
+        if file_count == 0:
+            print(f"{input_path}: no matching files", file=sys.stderr)
+            return 1
+        return error_count
+
+    def _run_check_file(self, input_path: Path) -> bool:
+        try:
+            with CompilationEngine(str(input_path), token_cache=self._token_cache) as engine:
+                engine.compile_class(workers=self._workers, executor=self._executor)
+        except JackSyntaxError as error:
+            print(f"{input_path}:{error}", file=sys.stderr)
+            return False
+        return True
+
+    def _run_analysis(self, input_path: Path, outline: bool):
         if input_path.is_file():
-            self._run_analysis_file(input_path)
+            self._run_analysis_file(input_path, outline)
         elif input_path.is_dir():
-            self._run_analysis_folder(input_path)
+            self._run_analysis_folder(input_path, outline)
 
     def _run_token_test(self, input_path: Path):
         if input_path.is_file():
@@ -26,18 +113,39 @@ class JackAnalyzer:
         elif input_path.is_dir():
             self._run_token_test_folder(input_path)
 
-    def _run_analysis_file(self, input_path: Path):
+    def _run_analysis_file(self, input_path: Path, outline: bool):
         input_path_str = str(input_path)
-        output_path_str = str(input_path.with_suffix(".xml"))
+        output_suffix = ".outline.xml" if outline else ".xml"
+        output_path_str = str(input_path.with_suffix(output_suffix))
+
+        if self._fingerprints_path is None:
+            with CompilationEngine(input_path_str, output_path_str, self._token_cache) as engine:
+                engine.compile_class(outline, self._workers, self._executor)
+            return
 
-        with CompilationEngine(input_path_str, output_path_str) as engine:
-            engine.compile_class()
+        # Outputs only depend on the token stream, so a file whose tokens are
+        # unchanged since its output was written needs no new output.
+        with input_path.open(mode="r") as input_file:
+            tokenizer = JackTokenizer(input_file.read(), self._token_cache)
+
+        # Outputs also depend on the code that wrote them, so the versions
+        # are stored with the fingerprint and a new version forces a rebuild.
+        fingerprint = f"{JackTokenizer.VERSION}.{CompilationEngine.VERSION}:{tokenizer.fingerprint()}"
+        output_key = str(Path(output_path_str).resolve())
+        if self._fingerprints.get(output_key) == fingerprint and Path(output_path_str).is_file():
+            self.skipped_count += 1
+            return
+
+        self._fingerprints.pop(output_key, None)
+        with CompilationEngine.from_tokenizer(tokenizer, output_path_str) as engine:
+            engine.compile_class(outline, self._workers, self._executor)
+        self._fingerprints[output_key] = fingerprint
 
     def _run_token_test_file(self, input_path: Path):
         with input_path.open(mode="r") as input_file:
             input_text = input_file.read()
 
-        tokenizer = JackTokenizer(input_text)
+        tokenizer = JackTokenizer(input_text, self._token_cache)
         xml_lines = []
         while tokenizer.has_more_tokens():
             tokenizer.advance()
@@ -71,14 +179,12 @@ class JackAnalyzer:
     def _escape(self, text: str) -> str:
         return html.escape(text)
 
-    def _run_analysis_folder(self, input_folder: Path):
-        jack_files = input_folder.glob("*.jack")
-        for jack_file in jack_files:
-            self._run_analysis_file(jack_file)
+    def _run_analysis_folder(self, input_folder: Path, outline: bool):
+        for jack_file in self._file_finder.find(input_folder):
+            self._run_analysis_file(jack_file, outline)
 
     def _run_token_test_folder(self, input_folder: Path):
-        jack_files = input_folder.glob("*.jack")
-        for jack_file in jack_files:
+        for jack_file in self._file_finder.find(input_folder):
             self._run_token_test_file(jack_file)
 
 
@@ -86,10 +192,30 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser()
     parser.add_argument("input_path")
     parser.add_argument("--token-test", action="store_true")
+    parser.add_argument("--outline", action="store_true")
+    parser.add_argument("--check", action="store_true")
+    parser.add_argument("--workers", type=int, default=1)
+    parser.add_argument("--recursive", action="store_true")
+    parser.add_argument("--include", action="append", default=[])
+    parser.add_argument("--exclude", action="append", default=[])
+    parser.add_argument("--file-list-cache")
+    parser.add_argument("--token-cache")
+    parser.add_argument("--token-cache-max-mb", type=int, default=64)
+    parser.add_argument("--fingerprints")
     args = parser.parse_args()
 
+    file_finder = JackFileFinder(
+        args.include or ["*.jack"], args.exclude, args.recursive, args.file_list_cache)
+    token_cache = None
+    if args.token_cache:
+        token_cache = TokenCache(args.token_cache, args.token_cache_max_mb * 1024 * 1024)
+    analyzer = JackAnalyzer(args.workers, file_finder, token_cache, args.fingerprints)
+    if args.check:
+        sys.exit(1 if analyzer.run(args.input_path, False, check=True) else 0)
+
     print(f"Start translating for '{args.input_path}'")
 
-    analyzer = JackAnalyzer()
-    analyzer.run(args.input_path, args.token_test)
+    analyzer.run(args.input_path, args.token_test, args.outline)
+    if args.fingerprints:
+        print(f"Skipped {analyzer.skipped_count} files with unchanged tokens")
     print("Completed")
@@ -0,0 +1,108 @@
+import os
+import json
+from fnmatch import fnmatch
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+class JackFileFinder:
+    def __init__(
+        self,
+        include: Sequence[str] = ("*.jack",),
+        exclude: Sequence[str] = (),
+        recursive: bool = False,
+        cache_path: Optional[str] = None
+    ):
+        self._include = list(include)
+        self._exclude = list(exclude)
+        self._recursive = recursive
+        self._cache_path = Path(cache_path) if cache_path else None
+
+    def find(self, root: Path) -> Iterator[Path]:
+        cached_folders = self._load_cache(root)
+        folders = {}
+        for path in self._scan(root, cached_folders, folders):
+            yield path
+
+        self._save_cache(root, folders)
+
+    def _scan(self, root: Path, cached_folders: Dict[str, dict], folders: Dict[str, dict]):
+        # Depth-first. A folder whose modification time matches the cached
+        # one has the same entries, so its cached listing is reused and only
+        # changed folders are listed again.
+        stack = [(str(root), "")]
+        while stack:
+            folder, relative_folder = stack.pop()
+            try:
+                mtime = os.stat(folder).st_mtime_ns if self._cache_path else None
+                cached_folder = cached_folders.get(relative_folder)
+                if mtime is not None and cached_folder is not None and cached_folder["mtime"] == mtime:
+                    file_names, folder_names = cached_folder["files"], cached_folder["folders"]
+                else:
+                    file_names, folder_names = self._list_folder(folder, relative_folder)
+            except OSError:
+                continue
+
+            folders[relative_folder] = {"mtime": mtime, "files": file_names, "folders": folder_names}
+            for file_name in file_names:
+                yield Path(folder, file_name)
+
+            stack.extend(
+                (os.path.join(folder, folder_name), f"{relative_folder}{folder_name}/")
+                for folder_name in reversed(folder_names))
+
+    def _list_folder(self, folder: str, relative_folder: str) -> Tuple[List[str], List[str]]:
+        # os.scandir returns the entry type along with the name, so no extra
+        # stat call is needed per entry. Symlinked folders are not followed,
+        # which keeps a link back to a parent from looping the recursion.
+        with os.scandir(folder) as scanner:
+            entries = sorted(scanner, key=lambda entry: entry.name)
+
+        file_names = []
+        folder_names = []
+        for entry in entries:
+            relative_path = f"{relative_folder}{entry.name}"
+            if self._matches(entry.name, relative_path, self._exclude):
+                continue
+
+            if entry.is_dir(follow_symlinks=False):
+                if self._recursive:
+                    folder_names.append(entry.name)
+            elif entry.is_file() and self._matches(entry.name, relative_path, self._include):
+                file_names.append(entry.name)
+
+        return file_names, folder_names
+
+    def _matches(self, name: str, relative_path: str, patterns: List[str]) -> bool:
+        return any(fnmatch(name, pattern) or fnmatch(relative_path, pattern) for pattern in patterns)
+
+    def _cache_key(self, root: Path) -> dict:
+        return {
+            "root": str(root.resolve()),
+            "include": self._include,
+            "exclude": self._exclude,
+            "recursive": self._recursive
+        }
+
+    def _load_cache(self, root: Path) -> Dict[str, dict]:
+        if self._cache_path is None or not self._cache_path.is_file():
+            return {}
+
+        try:
+            with self._cache_path.open(mode="r") as cache_file:
+                cache = json.load(cache_file)
+        except (OSError, ValueError):
+            return {}
+
+        if not isinstance(cache, dict) or cache.get("key") != self._cache_key(root):
+            return {}
+        return cache.get("folders", {})
+
+    def _save_cache(self, root: Path, folders: Dict[str, dict]):
+        if self._cache_path is None:
+            return
+
+        temp_path = self._cache_path.with_name(f"{self._cache_path.name}.tmp")
+        with temp_path.open(mode="w") as cache_file:
+            json.dump({"key": self._cache_key(root), "folders": folders}, cache_file)
+        os.replace(temp_path, self._cache_path)
@@ -1,6 +1,11 @@
 import re
+import hashlib
+from bisect import bisect_right
 from enum import Enum
-from typing import List
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+if TYPE_CHECKING:
+    from jack_compiler.token_cache import TokenCache
 
 
 class TokenType(Enum):
@@ -36,7 +41,23 @@ class KeywordType(Enum):
     THIS = "this"
 
 
+class JackSyntaxError(Exception):
+    def __init__(self, message: str, offset: int, line: int = 0, column: int = 0):
+        super().__init__(message, offset, line, column)
+        self.message = message
+        self.offset = offset
+        self.line = line
+        self.column = column
+
+    def __str__(self):
+        if self.line == 0:
+            return f"offset {self.offset}: {self.message}"
+        return f"{self.line}:{self.column}: {self.message}"
+
+
 class Token:
+    __slots__ = ("type", "text", "offset")
+
     KEYWORD_TABLE = {
         "class": KeywordType.CLASS,
         "constructor": KeywordType.CONSTRUCTOR,
@@ -61,9 +82,10 @@ class Token:
         "return": KeywordType.RETURN
     }
 
-    def __init__(self, token_type: TokenType, token_text: str):
+    def __init__(self, token_type: TokenType, token_text: str, offset: int = 0):
         self.type = token_type
         self.text = token_text
+        self.offset = offset
 
         if token_type == TokenType.IDENTFIER:
             if token_text in Token.KEYWORD_TABLE.keys():
@@ -73,43 +95,65 @@ class Token:
 
 
 class JackTokenizer:
+    # Bump whenever lexing changes so that cached token streams are dropped.
+    VERSION = 1
+
     SYMBOLS = {
         "{", "}", "(", ")", "[", "]", ".", ",", ";",
         "+", "-", "*", "/", "&", "|", "<", ">", "=", "~"
     }
 
-    def __init__(self, file_text: str):
-        self.tokens = self._parse_tokens(file_text)
+    SUBROUTINE_KEYWORDS = {"constructor", "function", "method"}
+
+    def __init__(self, file_text: str, token_cache: Optional["TokenCache"] = None):
+        tokens = token_cache.load(file_text) if token_cache is not None else None
+        if tokens is None:
+            tokens = self._parse_tokens(file_text)
+            if token_cache is not None:
+                token_cache.save(file_text, tokens)
+
+        self.tokens = tokens
         self.current_token_number = -1
+        self._file_text = file_text
+        self._line_starts = None
+
+    @classmethod
+    def from_tokens(cls, tokens: List[Token], file_text: Optional[str] = None) -> "JackTokenizer":
+        tokenizer = cls.__new__(cls)
+        tokenizer.tokens = tokens
+        tokenizer.current_token_number = -1
+        tokenizer._file_text = file_text
+        tokenizer._line_starts = None
+        return tokenizer
 
     def _parse_tokens(self, file_text: str) -> List[Token]:
         lines = self._get_valid_lines(file_text)
         tokens = []
 
-        for line in lines:
+        for line_offset, line in lines:
             token_type = TokenType.UNKNOWN
             token_start_index = 0
 
             for i in range(len(line)):
                 if line[i] in JackTokenizer.SYMBOLS:
                     if token_type != TokenType.UNKNOWN:
-                        tokens.append(Token(token_type, line[token_start_index:i]))
+                        tokens.append(Token(token_type, line[token_start_index:i], line_offset + token_start_index))
                         token_type = TokenType.UNKNOWN
 
-                    tokens.append(Token(TokenType.SYMBOL, line[i]))
+                    tokens.append(Token(TokenType.SYMBOL, line[i], line_offset + i))
                 elif line[i] == " ":
                     if token_type == token_type.STRING_CONST:
                         continue
 
                     if token_type != TokenType.UNKNOWN:
-                        tokens.append(Token(token_type, line[token_start_index:i]))
+                        tokens.append(Token(token_type, line[token_start_index:i], line_offset + token_start_index))
                         token_type = token_type.UNKNOWN
                 elif line[i] == '"':
                     if token_type == TokenType.UNKNOWN:
                         token_type = TokenType.STRING_CONST
                         token_start_index = i
                     else:
-                        tokens.append(Token(token_type, line[token_start_index+1:i]))
+                        tokens.append(Token(token_type, line[token_start_index+1:i], line_offset + token_start_index))
                         token_type = token_type.UNKNOWN
                 else:
                     if token_type == TokenType.UNKNOWN:
@@ -117,23 +161,32 @@ class JackTokenizer:
                         token_start_index = i
 
             if token_type != TokenType.UNKNOWN:
-                tokens.append(Token(token_type, line[token_start_index:len(line)]))
+                tokens.append(Token(token_type, line[token_start_index:len(line)], line_offset + token_start_index))
 
         return tokens
 
-    def _get_valid_lines(self, file_text: str) -> List[str]:
+    def _get_valid_lines(self, file_text: str) -> List[Tuple[int, str]]:
         file_text = self._delete_comments(file_text)
-        return [
-            valid_text
-            for line in file_text.splitlines()
-            if (valid_text := self._get_valid_text(line))
-        ]
+        valid_lines = []
+        line_offset = 0
+
+        for line in file_text.splitlines(keepends=True):
+            if valid_text := self._get_valid_text(line):
+                valid_lines.append((line_offset + len(line) - len(line.lstrip()), valid_text))
+            line_offset += len(line)
+
+        return valid_lines
 
     def _delete_comments(self, text: str) -> str:
+        # Blank out comments instead of removing them so that the offsets of
+        # the remaining tokens stay those of the source text.
         comment_regex = r"/\*.*?\*/"
-        text = re.sub(comment_regex, "", text, flags=re.DOTALL)
+        text = re.sub(comment_regex, self._blank_comment, text, flags=re.DOTALL)
         comment_regex = r"//.*"
-        return re.sub(comment_regex, "", text)
+        return re.sub(comment_regex, self._blank_comment, text)
+
+    def _blank_comment(self, match: re.Match) -> str:
+        return re.sub(r"[^\r\n]", " ", match.group())
 
     def _get_valid_text(self, text: str) -> str:
         return text.strip()
@@ -144,21 +197,122 @@ class JackTokenizer:
     def advance(self):
         self.current_token_number += 1
 
+    def skip_block(self):
+        depth = 0
+        for i in range(self.current_token_number, len(self.tokens)):
+            token = self.tokens[i]
+            if token.type != TokenType.SYMBOL:
+                continue
+
+            if token.text == "{":
+                depth += 1
+            elif token.text == "}":
+                depth -= 1
+                if depth == 0:
+                    self.current_token_number = i
+                    return
+
+        raise self.syntax_error("unterminated block")
+
+    def subroutine_spans(self, start: int = 0) -> List[Tuple[int, int]]:
+        # [start, end) token ranges of the subroutineDecs found at the brace
+        # depth of `start`, up to the brace that closes the enclosing class.
+        spans = []
+        depth = 0
+        span_start = -1
+        for i in range(start, len(self.tokens)):
+            token = self.tokens[i]
+            if token.type == TokenType.SYMBOL:
+                if token.text == "{":
+                    depth += 1
+                elif token.text == "}":
+                    depth -= 1
+                    if depth == 0 and span_start >= 0:
+                        spans.append((span_start, i+1))
+                        span_start = -1
+                    elif depth < 0:
+                        break
+            elif depth == 0 and span_start < 0 and token.type == TokenType.KEYWORD and \
+                    token.text in JackTokenizer.SUBROUTINE_KEYWORDS:
+                span_start = i
+
+        return spans
+
+    def offset(self) -> int:
+        if not self.tokens:
+            return 0
+
+        return self.tokens[min(self.current_token_number, len(self.tokens)-1)].offset
+
+    def fingerprint(self) -> str:
+        # Only kinds and texts are hashed, so edits to comments or
+        # whitespace leave the fingerprint unchanged.
+        return self._fingerprint(self.tokens)
+
+    def subroutine_fingerprints(self) -> Dict[str, str]:
+        class_body_start = next(
+            (i+1 for i, token in enumerate(self.tokens) if token.type == TokenType.SYMBOL and token.text == "{"),
+            len(self.tokens))
+
+        return {
+            self.tokens[span_start+2].text: self._fingerprint(self.tokens[span_start:span_end])
+            for span_start, span_end in self.subroutine_spans(class_body_start)
+            if span_start + 2 < span_end
+        }
+
+    def _fingerprint(self, tokens: List[Token]) -> str:
+        canonical_text = "\n".join([f"{token.type.value}{token.text}" for token in tokens])
+        return hashlib.blake2b(canonical_text.encode(), digest_size=16).hexdigest()
+
+    def position(self, offset: Optional[int] = None) -> Tuple[int, int]:
+        if offset is None:
+            offset = self.offset()
+
+        # The line index is only needed for diagnostics, so it is built on
+        # first use rather than while lexing.
+        if self._line_starts is None:
+            self._line_starts = [0]
+            self._line_starts.extend(match.end() for match in re.finditer(r"\r\n?|\n", self._file_text or ""))
+
+        line = bisect_right(self._line_starts, offset)
+        return line, offset - self._line_starts[line-1] + 1
+
+    def syntax_error(self, message: str) -> JackSyntaxError:
+        return self.locate(JackSyntaxError(message, self.offset()))
+
+    def locate(self, error: JackSyntaxError) -> JackSyntaxError:
+        if self._file_text is not None:
+            error.line, error.column = self.position(error.offset)
+        return error
+
+    def current_token(self) -> Token:
+        try:
+            return self.tokens[self.current_token_number]
+        except IndexError:
+            raise self.syntax_error("unexpected end of file") from None
+
     def token_type(self):
-        return self.tokens[self.current_token_number].type
+        return self.current_token().type
 
     def keyword(self):
-        token_text = self.tokens[self.current_token_number].text
-        return Token.KEYWORD_TABLE[token_text]
+        token_text = self.current_token().text
+        try:
+            return Token.KEYWORD_TABLE[token_text]
+        except KeyError:
+            raise self.syntax_error(f"expected keyword, got '{token_text}'") from None
 
     def symbol(self):
-        return self.tokens[self.current_token_number].text
+        return self.current_token().text
 
     def identifier(self):
-        return self.tokens[self.current_token_number].text
+        return self.current_token().text
 
     def int_val(self) -> int:
-        return int(self.tokens[self.current_token_number].text)
+        token_text = self.current_token().text
+        try:
+            return int(token_text)
+        except ValueError:
+            raise self.syntax_error(f"invalid integer constant '{token_text}'") from None
 
     def string_val(self):
-        return self.tokens[self.current_token_number].text
+        return self.current_token().text
@@ -0,0 +1,51 @@
+import html
+from jack_compiler.jack_tokenizer import Token, TokenType
+
+
+class ParseListener:
+    def start_rule(self, rule_name: str):
+        pass
+
+    def end_rule(self, rule_name: str):
+        pass
+
+    def terminal(self, token: Token):
+        pass
+
+
+class XmlWriter(ParseListener):
+    TAG_NAMES = {
+        TokenType.KEYWORD: "keyword",
+        TokenType.SYMBOL: "symbol",
+        TokenType.INT_CONST: "integerConstant",
+        TokenType.STRING_CONST: "stringConstant",
+        TokenType.IDENTFIER: "identifier"
+    }
+
+    def __init__(self, output_file, indent_width: int = 0):
+        self._output_file = output_file
+        self._indent_width = indent_width
+
+    def start_rule(self, rule_name: str):
+        self._output_file.write(f"{self._get_indent()}<{rule_name}>\n")
+        self._indent_width += 2
+
+    def end_rule(self, rule_name: str):
+        self._indent_width -= 2
+        self._output_file.write(f"{self._get_indent()}</{rule_name}>\n")
+
+    def terminal(self, token: Token):
+        tag_name = XmlWriter.TAG_NAMES[token.type]
+        self._output_file.write(f"{self._get_indent()}<{tag_name}>{self._format(token)}</{tag_name}>\n")
+
+    def _format(self, token: Token) -> str:
+        match token.type:
+            case TokenType.SYMBOL:
+                return html.escape(token.text)
+            case TokenType.INT_CONST:
+                return str(int(token.text))
+            case _:
+                return token.text
+
+    def _get_indent(self):
+        return " " * self._indent_width
@@ -0,0 +1,77 @@
+import json
+from typing import List, Optional, Union
+from jack_compiler.jack_tokenizer import Token
+from jack_compiler.parse_listener import ParseListener, XmlWriter
+
+
+class ParseNode:
+    __slots__ = ("rule_name", "children")
+
+    def __init__(self, rule_name: str):
+        self.rule_name = rule_name
+        self.children: List[Union["ParseNode", Token]] = []
+
+
+class TreeBuilder(ParseListener):
+    def __init__(self):
+        self.root: Optional[ParseNode] = None
+        self._node_stack: List[ParseNode] = []
+
+    def start_rule(self, rule_name: str):
+        node = ParseNode(rule_name)
+        if self._node_stack:
+            self._node_stack[-1].children.append(node)
+        else:
+            self.root = node
+        self._node_stack.append(node)
+
+    def end_rule(self, rule_name: str):
+        self._node_stack.pop()
+
+    def terminal(self, token: Token):
+        self._node_stack[-1].children.append(token)
+
+
+class ParseTreeVisitor:
+    def visit(self, node: Union[ParseNode, Token]):
+        if isinstance(node, Token):
+            return self.visit_token(node)
+
+        visit_rule = getattr(self, f"visit_{node.rule_name}", self.generic_visit)
+        return visit_rule(node)
+
+    def generic_visit(self, node: ParseNode):
+        for child in node.children:
+            self.visit(child)
+
+    def visit_token(self, token: Token):
+        pass
+
+
+def walk(node: ParseNode, listener: ParseListener):
+    listener.start_rule(node.rule_name)
+    for child in node.children:
+        if isinstance(child, Token):
+            listener.terminal(child)
+        else:
+            walk(child, listener)
+    listener.end_rule(node.rule_name)
+
+
+def write_xml(node: ParseNode, output_file):
+    walk(node, XmlWriter(output_file))
+
+
+def to_dict(node: ParseNode) -> dict:
+    return {
+        "rule": node.rule_name,
+        "children": [
+            {"type": XmlWriter.TAG_NAMES[child.type], "text": child.text}
+            if isinstance(child, Token) else to_dict(child)
+            for child in node.children
+        ]
+    }
+
+
+def write_json(node: ParseNode, output_file):
+    json.dump(to_dict(node), output_file, separators=(",", ":"))
@@ -1,7 +1,9 @@
 import unittest
+from unittest import mock
 from pathlib import Path
 
 from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_tokenizer import JackSyntaxError, JackTokenizer
 
 
 class TestCompilationEngine(unittest.TestCase):
@@ -41,15 +43,102 @@ class TestCompilationEngine(unittest.TestCase):
     def test_compile_class_given_expression(self):
         self._test_compile_class("expression")
 
+    def test_compile_class_outline(self):
+        with self._create_engine("outline", "outline") as engine:
+            engine.compile_class(outline=True)
+
+        self._verify_file("outline")
+
+    def test_compile_class_outline_given_missing_body_brace(self):
+        with CompilationEngine("test_data/check/missing_body_brace.jack") as engine:
+            with self.assertRaises(JackSyntaxError) as context:
+                engine.compile_class(outline=True)
+
+        self.assertEqual("2:21: expected symbol, got 'return'", str(context.exception))
+
+    def test_compile_class_outline_given_unterminated_body(self):
+        with CompilationEngine("test_data/check/unterminated_body.jack") as engine:
+            with self.assertRaises(JackSyntaxError) as context:
+                engine.compile_class(outline=True)
+
+        self.assertEqual("2:21: unterminated block", str(context.exception))
+
+    @mock.patch.object(CompilationEngine, "MIN_PARALLEL_TOKENS", 0)
+    def test_compile_class_given_workers(self):
+        for test_name in ("subroutine_dec", "expression", "if_statement"):
+            with self._create_engine(test_name, test_name) as engine:
+                engine.compile_class(workers=2)
+
+            self._verify_file(test_name)
+
+        with self._create_engine("outline", "outline") as engine:
+            engine.compile_class(outline=True, workers=2)
+
+        self._verify_file("outline")
+
+    def test_compile_class_given_workers_and_small_class(self):
+        executor = mock.Mock()
+        with mock.patch("jack_compiler.compilation_engine.ProcessPoolExecutor") as process_pool_executor:
+            with self._create_engine("expression", "expression") as engine:
+                engine.compile_class(workers=4)
+            with self._create_engine("expression", "expression") as engine:
+                engine.compile_class(workers=4, executor=executor)
+
+        process_pool_executor.assert_not_called()
+        executor.map.assert_not_called()
+        self._verify_file("expression")
+
+    @mock.patch.object(CompilationEngine, "MIN_PARALLEL_TOKENS", 0)
+    def test_compile_class_given_workers_and_syntax_error(self):
+        with CompilationEngine("test_data/check/syntax_error.jack") as engine:
+            with self.assertRaises(JackSyntaxError) as context:
+                engine.compile_class(workers=2)
+
+        self.assertEqual("5:13: expected term, got ';'", str(context.exception))
+
+    @mock.patch.object(CompilationEngine, "MIN_PARALLEL_TOKENS", 0)
+    def test_compile_class_given_workers_and_chunk_overrun(self):
+        # The unbalanced call makes the last subroutineDec read past the end
+        # of its chunk; the parallel run must fail just like the sequential one.
+        methods = "".join(f"method void m{i}() {{ return; }}\n" for i in range(20))
+        input_text = (
+            f"class Main {{\n{methods}"
+            "function void last() { if (x) { let a = 1; } else { do g(a ( b); } "
+            "while (y) { let c = (a + 1); } return; }\n}\n")
+
+        errors = []
+        for workers in (1, 2):
+            engine = CompilationEngine.from_tokenizer(JackTokenizer(input_text))
+            with self.assertRaises(JackSyntaxError) as context:
+                engine.compile_class(workers=workers)
+            errors.append(str(context.exception))
+
+        self.assertEqual(["23:1: unexpected end of file"] * 2, errors)
+
+    def test_compile_class_given_syntax_error(self):
+        with CompilationEngine("test_data/check/syntax_error.jack") as engine:
+            with self.assertRaises(JackSyntaxError) as context:
+                engine.compile_class()
+
+        self.assertEqual((5, 13), (context.exception.line, context.exception.column))
+        self.assertEqual("5:13: expected term, got ';'", str(context.exception))
+
+    def test_compile_class_given_unexpected_end(self):
+        with CompilationEngine("test_data/check/unexpected_end.jack") as engine:
+            with self.assertRaises(JackSyntaxError) as context:
+                engine.compile_class()
+
+        self.assertEqual("unexpected end of file", context.exception.message)
+
     def _test_compile_class(self, test_name):
-        with self._create_engine(test_name) as engine:
+        with self._create_engine(test_name, test_name) as engine:
             engine.compile_class()
 
         self._verify_file(test_name)
 
-    def _create_engine(self, test_name):
-        input_path_str = f"test_data/compile/{test_name}.jack"
-        output_path_str = f"test_data/compile/{test_name}.xml"
+    def _create_engine(self, input_name, output_name):
+        input_path_str = f"test_data/compile/{input_name}.jack"
+        output_path_str = f"test_data/compile/{output_name}.xml"
 
         return CompilationEngine(input_path_str, output_path_str)
 
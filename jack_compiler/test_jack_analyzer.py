@@ -1,8 +1,15 @@
 import unittest
+import io
 import os
+import shutil
+import tempfile
+from contextlib import redirect_stderr
+from unittest import mock
 from pathlib import Path
 
 from jack_compiler.jack_analyzer import JackAnalyzer
+from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_tokenizer import JackTokenizer
 
 
 class TestJackAnalyzer(unittest.TestCase):
@@ -20,6 +27,83 @@ class TestJackAnalyzer(unittest.TestCase):
         self._verify_token("token.jack")
         self._verify_token("token2.jack")
 
+    def test_check_given_valid_folder(self):
+        analyzer = JackAnalyzer()
+        self.assertEqual(0, analyzer.run("test_data/compile", False, check=True))
+        for jack_file in Path("test_data/compile").glob("*.jack"):
+            self.assertFalse(jack_file.with_suffix(".xml").exists())
+
+    @mock.patch.object(CompilationEngine, "MIN_PARALLEL_TOKENS", 0)
+    def test_check_given_workers(self):
+        analyzer = JackAnalyzer(workers=2)
+        with mock.patch("jack_compiler.compilation_engine.ProcessPoolExecutor") as process_pool_executor:
+            self.assertEqual(0, analyzer.run("test_data/compile", False, check=True))
+
+        process_pool_executor.assert_not_called()
+
+    def test_check_given_invalid_folder(self):
+        analyzer = JackAnalyzer()
+        with redirect_stderr(io.StringIO()) as stderr:
+            error_count = analyzer.run("test_data/check", False, check=True)
+
+        self.assertEqual(4, error_count)
+        self.assertIn("syntax_error.jack:5:13: expected term, got ';'", stderr.getvalue())
+        self.assertEqual([], list(Path("test_data/check").glob("*.xml")))
+
+    def test_check_given_missing_path(self):
+        analyzer = JackAnalyzer()
+        with redirect_stderr(io.StringIO()) as stderr:
+            error_count = analyzer.run("test_data/missing", False, check=True)
+
+        self.assertEqual(1, error_count)
+        self.assertIn("test_data/missing: no such file or directory", stderr.getvalue())
+
+    def test_check_given_folder_without_jack_files(self):
+        analyzer = JackAnalyzer()
+        with tempfile.TemporaryDirectory() as temp_dir:
+            with redirect_stderr(io.StringIO()) as stderr:
+                error_count = analyzer.run(temp_dir, False, check=True)
+
+        self.assertEqual(1, error_count)
+        self.assertIn("no matching files", stderr.getvalue())
+
+    def test_analysis_given_fingerprints(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            jack_path = Path(temp_dir, "expression.jack")
+            shutil.copy("test_data/compile/expression.jack", jack_path)
+            fingerprints_path = str(Path(temp_dir, "fingerprints.json"))
+
+            analyzer = JackAnalyzer(fingerprints_path=fingerprints_path)
+            analyzer.run(temp_dir, False)
+            self.assertEqual(0, analyzer.skipped_count)
+
+            jack_path.write_text("// comment only edit\n" + jack_path.read_text())
+            analyzer = JackAnalyzer(fingerprints_path=fingerprints_path)
+            analyzer.run(temp_dir, False)
+            self.assertEqual(1, analyzer.skipped_count)
+
+            jack_path.write_text(jack_path.read_text().replace("return 1;", "return 2;"))
+            analyzer = JackAnalyzer(fingerprints_path=fingerprints_path)
+            analyzer.run(temp_dir, False)
+            self.assertEqual(0, analyzer.skipped_count)
+            self.assertIn("<integerConstant>2</integerConstant>", jack_path.with_suffix(".xml").read_text())
+
+    def test_analysis_given_fingerprints_and_new_version(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            shutil.copy("test_data/compile/expression.jack", Path(temp_dir, "expression.jack"))
+            fingerprints_path = str(Path(temp_dir, "fingerprints.json"))
+            JackAnalyzer(fingerprints_path=fingerprints_path).run(temp_dir, False)
+
+            with mock.patch.object(CompilationEngine, "VERSION", CompilationEngine.VERSION + 1):
+                analyzer = JackAnalyzer(fingerprints_path=fingerprints_path)
+                analyzer.run(temp_dir, False)
+            self.assertEqual(0, analyzer.skipped_count)
+
+            with mock.patch.object(JackTokenizer, "VERSION", JackTokenizer.VERSION + 1):
+                analyzer = JackAnalyzer(fingerprints_path=fingerprints_path)
+                analyzer.run(temp_dir, False)
+            self.assertEqual(0, analyzer.skipped_count)
+
     def _verify_token(self, file_name: str):
         test_name = Path(file_name).stem
 
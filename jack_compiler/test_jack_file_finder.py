@@ -0,0 +1,72 @@
+import os
+import unittest
+import tempfile
+from unittest import mock
+from pathlib import Path
+
+from jack_compiler.jack_file_finder import JackFileFinder
+
+
+class TestJackFileFinder(unittest.TestCase):
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.root = Path(self._temp_dir.name, "project")
+        self.cache_path = str(Path(self._temp_dir.name, "files.json"))
+        for relative_path in ("Main.jack", "notes.txt", "lib/List.jack", "lib/deep/Node.jack", "build/Gen.jack"):
+            path = self.root / relative_path
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text("class A {}\n")
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_find_given_default(self):
+        self.assertEqual(["Main.jack"], self._find(JackFileFinder()))
+
+    def test_find_given_recursive(self):
+        self.assertEqual(
+            ["Main.jack", "build/Gen.jack", "lib/List.jack", "lib/deep/Node.jack"],
+            self._find(JackFileFinder(recursive=True)))
+
+    def test_find_given_exclude(self):
+        finder = JackFileFinder(exclude=["build", "lib/deep/*"], recursive=True)
+        self.assertEqual(["Main.jack", "lib/List.jack"], self._find(finder))
+
+    def test_find_given_include(self):
+        finder = JackFileFinder(include=["lib/*.jack"], recursive=True)
+        self.assertEqual(["lib/List.jack", "lib/deep/Node.jack"], self._find(finder))
+
+    def test_find_given_recursive_and_symlink_loop(self):
+        os.symlink("..", self.root / "lib/loop", target_is_directory=True)
+        self.assertEqual(
+            ["Main.jack", "build/Gen.jack", "lib/List.jack", "lib/deep/Node.jack"],
+            self._find(JackFileFinder(recursive=True)))
+
+    def test_find_given_cache(self):
+        finder = JackFileFinder(recursive=True, cache_path=self.cache_path)
+        self.assertEqual(
+            ["Main.jack", "build/Gen.jack", "lib/List.jack", "lib/deep/Node.jack"], self._find(finder))
+
+        with mock.patch("os.scandir", side_effect=AssertionError("unchanged folder listed")):
+            self.assertEqual(
+                ["Main.jack", "build/Gen.jack", "lib/List.jack", "lib/deep/Node.jack"], self._find(finder))
+
+    def test_find_given_cache_and_new_files(self):
+        finder = JackFileFinder(recursive=True, cache_path=self.cache_path)
+        self._find(finder)
+
+        (self.root / "Other.jack").write_text("class B {}\n")
+        (self.root / "lib/deep/Leaf.jack").write_text("class C {}\n")
+        self._touch_later(self.root, self.root / "lib/deep")
+        self.assertEqual(
+            ["Main.jack", "Other.jack", "build/Gen.jack", "lib/List.jack", "lib/deep/Leaf.jack", "lib/deep/Node.jack"],
+            self._find(finder))
+
+    def _touch_later(self, *folders):
+        # Guards against file systems with a coarse modification time.
+        for folder in folders:
+            mtime_ns = os.stat(folder).st_mtime_ns + 1_000_000_000
+            os.utime(folder, ns=(mtime_ns, mtime_ns))
+
+    def _find(self, finder):
+        return [path.relative_to(self.root).as_posix() for path in finder.find(self.root)]
@@ -1,6 +1,6 @@
 import unittest
 
-from jack_compiler.jack_tokenizer import JackTokenizer, TokenType, Token
+from jack_compiler.jack_tokenizer import JackSyntaxError, JackTokenizer, TokenType, Token
 
 
 class TestJackTokenizer(unittest.TestCase):
@@ -132,3 +132,60 @@ class TestJackTokenizer(unittest.TestCase):
         tokenizer = JackTokenizer('"test string"')
         tokenizer.advance()
         self.assertEqual("test string", tokenizer.string_val())
+
+    def test_skip_block_given_nested_block(self):
+        tokenizer = JackTokenizer("{ if (a) { let b = 1; } } return;")
+        tokenizer.advance()
+        tokenizer.skip_block()
+        self.assertEqual("}", tokenizer.symbol())
+
+        tokenizer.advance()
+        self.assertEqual("return", tokenizer.identifier())
+
+    def test_position_given_comments(self):
+        tokenizer = JackTokenizer("/* first\n   second */ let\n  // comment\n  x = 1;")
+        tokenizer.advance()
+        self.assertEqual((2, 14), tokenizer.position())
+
+        tokenizer.advance()
+        self.assertEqual((4, 3), tokenizer.position())
+
+    def test_subroutine_spans_given_class(self):
+        tokenizer = JackTokenizer("class A { field int a; function void f() { if (a) { } } method int g() { } }")
+        self.assertEqual([(7, 20), (20, 27)], tokenizer.subroutine_spans(7))
+
+    def test_position_given_crlf_and_line_comment(self):
+        tokenizer = JackTokenizer("let // comment\r\n\r\n\tx = 1;")
+        self.assertIsNone(tokenizer._line_starts)
+
+        tokenizer.advance()
+        tokenizer.advance()
+        self.assertEqual(19, tokenizer.offset())
+        self.assertEqual((3, 2), tokenizer.position())
+
+    def test_int_val_given_invalid_int_const(self):
+        tokenizer = JackTokenizer("\n 12ab")
+        tokenizer.advance()
+        with self.assertRaises(JackSyntaxError) as context:
+            tokenizer.int_val()
+
+        self.assertEqual((2, 2), (context.exception.line, context.exception.column))
+
+    def test_fingerprint_given_comment_and_whitespace_edit(self):
+        tokenizer = JackTokenizer("let x = 1;")
+        edited_tokenizer = JackTokenizer("/* doc */\n  let x=1; // note")
+        self.assertEqual(tokenizer.fingerprint(), edited_tokenizer.fingerprint())
+
+    def test_fingerprint_given_token_edit(self):
+        self.assertNotEqual(JackTokenizer("let x = 1;").fingerprint(), JackTokenizer("let x = 2;").fingerprint())
+        self.assertNotEqual(JackTokenizer('"do"').fingerprint(), JackTokenizer("do").fingerprint())
+
+    def test_subroutine_fingerprints_given_class(self):
+        text = "class A { field int a; function void f() { return; } method int g() { return a; } }"
+        edited_text = text.replace("return a;", "return a + 1;")
+
+        fingerprints = JackTokenizer(text).subroutine_fingerprints()
+        edited_fingerprints = JackTokenizer(edited_text).subroutine_fingerprints()
+        self.assertEqual(["f", "g"], list(fingerprints))
+        self.assertEqual(fingerprints["f"], edited_fingerprints["f"])
+        self.assertNotEqual(fingerprints["g"], edited_fingerprints["g"])
@@ -0,0 +1,66 @@
+import io
+import unittest
+from unittest import mock
+
+from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.jack_tokenizer import Token, TokenType
+from jack_compiler.parse_listener import ParseListener, XmlWriter
+
+
+class EventCollector(ParseListener):
+    def __init__(self):
+        self.events = []
+
+    def start_rule(self, rule_name):
+        self.events.append(f"<{rule_name}>")
+
+    def end_rule(self, rule_name):
+        self.events.append(f"</{rule_name}>")
+
+    def terminal(self, token):
+        self.events.append(token.text)
+
+
+class TestParseListener(unittest.TestCase):
+    def test_xml_writer_given_events(self):
+        output = io.StringIO()
+        writer = XmlWriter(output)
+        writer.start_rule("expression")
+        writer.terminal(Token(TokenType.INT_CONST, "007"))
+        writer.terminal(Token(TokenType.SYMBOL, "<"))
+        writer.terminal(Token(TokenType.IDENTFIER, "a"))
+        writer.end_rule("expression")
+
+        self.assertEqual(
+            "<expression>\n"
+            "  <integerConstant>7</integerConstant>\n"
+            "  <symbol>&lt;</symbol>\n"
+            "  <identifier>a</identifier>\n"
+            "</expression>\n",
+            output.getvalue())
+
+    def test_events_given_engine(self):
+        collector = EventCollector()
+        with CompilationEngine("test_data/compile/subroutine_dec.jack") as engine:
+            engine.add_listener(collector)
+            engine.compile_class()
+
+        self.assertEqual(
+            ["<class>", "class", "Test", "{", "<subroutineDec>", "constructor", "Test", "new", "("],
+            collector.events[:9])
+        self.assertEqual(["}", "</class>"], collector.events[-2:])
+        self.assertEqual(collector.events.count("<statements>"), collector.events.count("</statements>"))
+
+    @mock.patch.object(CompilationEngine, "MIN_PARALLEL_TOKENS", 0)
+    def test_events_given_engine_with_workers(self):
+        sequential_collector = EventCollector()
+        with CompilationEngine("test_data/compile/outline.jack") as engine:
+            engine.add_listener(sequential_collector)
+            engine.compile_class()
+
+        parallel_collector = EventCollector()
+        with CompilationEngine("test_data/compile/outline.jack") as engine:
+            engine.add_listener(parallel_collector)
+            engine.compile_class(workers=2)
+
+        self.assertEqual(sequential_collector.events, parallel_collector.events)
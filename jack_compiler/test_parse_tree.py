@@ -0,0 +1,54 @@
+import io
+import json
+import unittest
+
+from jack_compiler.compilation_engine import CompilationEngine
+from jack_compiler.parse_tree import ParseTreeVisitor, to_dict, write_json, write_xml
+
+
+class RuleCounter(ParseTreeVisitor):
+    def __init__(self):
+        self.statement_count = 0
+        self.token_count = 0
+
+    def visit_returnStatement(self, node):
+        self.statement_count += 1
+        self.generic_visit(node)
+
+    def visit_token(self, token):
+        self.token_count += 1
+
+
+class TestParseTree(unittest.TestCase):
+    def setUp(self):
+        self.maxDiff = None
+
+    def test_write_xml_given_expression(self):
+        tree = self._build_tree("expression")
+        output = io.StringIO()
+        write_xml(tree, output)
+
+        with open("test_data/compile/solution_expression.xml", "r") as solution_file:
+            self.assertEqual(solution_file.read(), output.getvalue())
+
+    def test_visitor_given_expression(self):
+        counter = RuleCounter()
+        counter.visit(self._build_tree("expression"))
+
+        self.assertEqual(12, counter.statement_count)
+        self.assertEqual(76, counter.token_count)
+
+    def test_write_json_given_subroutine_dec(self):
+        tree = self._build_tree("subroutine_dec")
+        output = io.StringIO()
+        write_json(tree, output)
+
+        tree_dict = json.loads(output.getvalue())
+        self.assertEqual(to_dict(tree), tree_dict)
+        self.assertEqual("class", tree_dict["rule"])
+        self.assertEqual({"type": "identifier", "text": "Test"}, tree_dict["children"][1])
+        self.assertEqual("subroutineDec", tree_dict["children"][3]["rule"])
+
+    def _build_tree(self, test_name):
+        with CompilationEngine(f"test_data/compile/{test_name}.jack") as engine:
+            return engine.build_parse_tree()
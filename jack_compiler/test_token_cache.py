@@ -0,0 +1,121 @@
+import os
+import unittest
+import tempfile
+from pathlib import Path
+from unittest import mock
+
+from jack_compiler.jack_tokenizer import JackTokenizer
+from jack_compiler.token_cache import TokenCache
+
+
+class TestTokenCache(unittest.TestCase):
+    TEXT = 'class A {\n  // comment\n  function void f() { do Output.printString("a b"); let x = 12; }\n}\n'
+
+    def setUp(self):
+        self._temp_dir = tempfile.TemporaryDirectory()
+        self.cache_dir = Path(self._temp_dir.name)
+
+    def tearDown(self):
+        self._temp_dir.cleanup()
+
+    def test_load_given_empty_cache(self):
+        cache = TokenCache(str(self.cache_dir))
+        self.assertIsNone(cache.load(self.TEXT))
+
+    def test_load_given_saved_tokens(self):
+        cache = TokenCache(str(self.cache_dir))
+        tokens = JackTokenizer(self.TEXT).tokens
+        cache.save(self.TEXT, tokens)
+
+        loaded_tokens = cache.load(self.TEXT)
+        self.assertEqual(self._describe(tokens), self._describe(loaded_tokens))
+        self.assertIsNone(cache.load(self.TEXT + " "))
+
+    def test_load_given_large_distances_and_many_texts(self):
+        # Distances and indexes that do not fit in one byte go through the
+        # overflow values.
+        statements = " ".join(f"let x{i} = {i};" for i in range(300))
+        text = f"class A {{\n  /* {'-' * 400} */\n  function void f() {{ {statements} }}\n}}\n"
+        cache = TokenCache(str(self.cache_dir))
+        tokens = JackTokenizer(text).tokens
+        cache.save(text, tokens)
+
+        self.assertEqual(self._describe(tokens), self._describe(cache.load(text)))
+
+    def test_load_given_new_tokenizer_version(self):
+        cache = TokenCache(str(self.cache_dir))
+        cache.save(self.TEXT, JackTokenizer(self.TEXT).tokens)
+
+        with mock.patch.object(JackTokenizer, "VERSION", JackTokenizer.VERSION + 1):
+            self.assertIsNone(cache.load(self.TEXT))
+
+    def test_load_given_corrupt_file(self):
+        cache = TokenCache(str(self.cache_dir))
+        cache.save(self.TEXT, JackTokenizer(self.TEXT).tokens)
+        cache_path = next(self.cache_dir.glob("*.tokens"))
+        cache_path.write_bytes(cache_path.read_bytes()[:-3])
+
+        self.assertIsNone(cache.load(self.TEXT))
+
+    def test_tokenizer_given_cache(self):
+        cache = TokenCache(str(self.cache_dir))
+        JackTokenizer(self.TEXT, cache)
+
+        with mock.patch.object(JackTokenizer, "_parse_tokens") as parse_tokens:
+            tokenizer = JackTokenizer(self.TEXT, cache)
+
+        parse_tokens.assert_not_called()
+        self.assertEqual(self._describe(JackTokenizer(self.TEXT).tokens), self._describe(tokenizer.tokens))
+
+    def test_save_given_size_limit(self):
+        texts = [f"class C{i} {{}}\n" for i in range(3)]
+        entry_size = len(TokenCache(str(self.cache_dir))._encode(JackTokenizer(texts[0]).tokens))
+        cache = TokenCache(str(self.cache_dir), max_bytes=entry_size * 5 // 2)
+
+        cache.save(texts[0], JackTokenizer(texts[0]).tokens)
+        cache.save(texts[1], JackTokenizer(texts[1]).tokens)
+        old_time = os.stat(cache._cache_path(texts[1])).st_mtime - 10
+        os.utime(cache._cache_path(texts[1]), (old_time, old_time))
+        cache.load(texts[0])
+        cache.save(texts[2], JackTokenizer(texts[2]).tokens)
+
+        self.assertIsNotNone(cache.load(texts[0]))
+        self.assertIsNone(cache.load(texts[1]))
+        self.assertIsNotNone(cache.load(texts[2]))
+
+    def test_save_given_many_files(self):
+        cache = TokenCache(str(self.cache_dir))
+        with mock.patch("os.scandir", wraps=os.scandir) as scandir:
+            for i in range(20):
+                text = f"class C{i} {{}}\n"
+                cache.save(text, JackTokenizer(text).tokens)
+
+        self.assertEqual(1, scandir.call_count)
+        self.assertEqual(20, len(list(self.cache_dir.glob("*.tokens"))))
+
+    def test_save_given_unwritable_cache(self):
+        cache = TokenCache(str(self.cache_dir))
+        with mock.patch("os.replace", side_effect=OSError("read-only file system")):
+            tokenizer = JackTokenizer(self.TEXT, cache)
+
+        self.assertEqual(self._describe(JackTokenizer(self.TEXT).tokens), self._describe(tokenizer.tokens))
+        self.assertEqual([], list(self.cache_dir.iterdir()))
+
+    def test_save_given_deleted_cache_dir(self):
+        cache = TokenCache(str(self.cache_dir))
+        self.cache_dir.rmdir()
+
+        tokenizer = JackTokenizer(self.TEXT, cache)
+        self.assertEqual(self._describe(JackTokenizer(self.TEXT).tokens), self._describe(tokenizer.tokens))
+
+    def test_tokenizer_given_uncreatable_cache_dir(self):
+        blocking_file = self.cache_dir / "file"
+        blocking_file.write_text("")
+        cache = TokenCache(str(blocking_file / "cache"))
+
+        tokenizer = JackTokenizer(self.TEXT, cache)
+        self.assertEqual(self._describe(JackTokenizer(self.TEXT).tokens), self._describe(tokenizer.tokens))
+        self.assertIsNone(cache.load(self.TEXT))
+
+    def _describe(self, tokens):
+        return [(token.type, token.text, token.offset) for token in tokens]
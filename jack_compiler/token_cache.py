@@ -0,0 +1,197 @@
+import os
+import sys
+import struct
+import hashlib
+from array import array
+from collections import Counter
+from itertools import accumulate
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+from jack_compiler.jack_tokenizer import JackTokenizer, Token, TokenType
+
+
+class TokenCache:
+    # File layout: header, one type code byte per string table entry, the
+    # distance of each token from the previous one, each token's index into
+    # the string table, the overflow values, then the string table joined
+    # with newlines, which never occur inside a token. The table holds the
+    # distinct (type, text) pairs, most frequent first, so nearly every
+    # distance and index fits in one byte; a larger value is stored as
+    # OVERFLOW and read, in order, from the 32-bit overflow values.
+    MAGIC = b"JTC3"
+    HEADER = struct.Struct("<4sIIII")
+    OVERFLOW = 0xFF
+    SUFFIX = ".tokens"
+    TOKEN_TYPES = {token_type.value: token_type for token_type in TokenType}
+    EVICTION_RATIO = 0.9
+
+    def __init__(self, cache_dir: str, max_bytes: int = 64 * 1024 * 1024):
+        self._cache_dir = Path(cache_dir)
+        self._max_bytes = max_bytes
+        self._total_bytes = None
+        # Like saving, a cache directory that cannot be created must not fail
+        # the compilation; the cache then does nothing.
+        try:
+            self._cache_dir.mkdir(parents=True, exist_ok=True)
+            self._enabled = True
+        except OSError:
+            self._enabled = False
+
+    def load(self, file_text: str) -> Optional[List[Token]]:
+        if not self._enabled:
+            return None
+
+        cache_path = self._cache_path(file_text)
+        try:
+            with cache_path.open(mode="rb") as cache_file:
+                data = cache_file.read()
+            tokens = self._decode(data)
+        except (OSError, ValueError, struct.error, KeyError, IndexError):
+            return None
+
+        # The modification time is the recency used for eviction.
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return tokens
+
+    def save(self, file_text: str, tokens: List[Token]):
+        # Saving is best effort: a cache that cannot be written must not fail
+        # the compilation of a valid file.
+        if not self._enabled:
+            return
+
+        cache_path = self._cache_path(file_text)
+        temp_path = cache_path.with_name(f"{cache_path.name}.{os.getpid()}.tmp")
+        data = self._encode(tokens)
+        try:
+            with temp_path.open(mode="wb") as cache_file:
+                cache_file.write(data)
+            replaced_size = self._file_size(cache_path)
+            os.replace(temp_path, cache_path)
+        except OSError:
+            try:
+                temp_path.unlink()
+            except OSError:
+                pass
+            return
+
+        if self._total_bytes is None:
+            self._total_bytes = self._scan_total_bytes()
+        else:
+            self._total_bytes += len(data) - replaced_size
+
+        if self._total_bytes > self._max_bytes:
+            self._evict()
+
+    def _file_size(self, path: Path) -> int:
+        try:
+            return path.stat().st_size
+        except OSError:
+            return 0
+
+    def _cache_path(self, file_text: str) -> Path:
+        digest = hashlib.sha256(f"{JackTokenizer.VERSION}:{sys.byteorder}:".encode())
+        digest.update(file_text.encode())
+        return self._cache_dir / f"{digest.hexdigest()}{TokenCache.SUFFIX}"
+
+    def _encode(self, tokens: List[Token]) -> bytes:
+        entry_counts = Counter((token.type.value, token.text) for token in tokens)
+        entries = [entry for entry, _ in entry_counts.most_common()]
+        entry_indexes = {entry: i for i, entry in enumerate(entries)}
+        distances = [token.offset for token in tokens]
+        for i in range(len(distances)-1, 0, -1):
+            distances[i] -= distances[i-1]
+        text_indexes = [entry_indexes[(token.type.value, token.text)] for token in tokens]
+
+        overflow = array("I")
+        distance_bytes = self._pack_bytes(distances, overflow)
+        index_bytes = self._pack_bytes(text_indexes, overflow)
+        string_table = "\n".join(text for _, text in entries).encode()
+        return b"".join([
+            TokenCache.HEADER.pack(TokenCache.MAGIC, len(tokens), len(entries), len(overflow), len(string_table)),
+            bytes(type_value for type_value, _ in entries), distance_bytes, index_bytes, overflow.tobytes(),
+            string_table
+        ])
+
+    def _pack_bytes(self, values: List[int], overflow: array) -> bytes:
+        if max(values, default=0) < TokenCache.OVERFLOW:
+            return bytes(values)
+
+        overflow.extend(value for value in values if value >= TokenCache.OVERFLOW)
+        return bytes(min(value, TokenCache.OVERFLOW) for value in values)
+
+    def _unpack_bytes(self, data: bytes, overflow: Iterator[int]) -> List[int]:
+        values = list(data)
+        position = data.find(TokenCache.OVERFLOW)
+        while position != -1:
+            values[position] = next(overflow)
+            position = data.find(TokenCache.OVERFLOW, position + 1)
+        return values
+
+    def _decode(self, data: bytes) -> List[Token]:
+        magic, token_count, entry_count, overflow_count, string_table_size = TokenCache.HEADER.unpack_from(data)
+        if magic != TokenCache.MAGIC:
+            raise ValueError("not a token cache file")
+
+        position = TokenCache.HEADER.size
+        entry_types = data[position:position+entry_count]
+        position += entry_count
+        distance_bytes = data[position:position+token_count]
+        position += token_count
+        index_bytes = data[position:position+token_count]
+        position += token_count
+
+        overflow = array("I")
+        overflow.frombytes(data[position:position+overflow_count*overflow.itemsize])
+        position += overflow_count * overflow.itemsize
+
+        string_table = data[position:position+string_table_size].decode().split("\n")
+        if len(index_bytes) != token_count or position + string_table_size != len(data) or \
+                len(overflow) != distance_bytes.count(TokenCache.OVERFLOW) + index_bytes.count(TokenCache.OVERFLOW):
+            raise ValueError("truncated token cache file")
+
+        overflow_values = iter(overflow)
+        offsets = accumulate(self._unpack_bytes(distance_bytes, overflow_values))
+        text_indexes = self._unpack_bytes(index_bytes, overflow_values)
+
+        token_types = [TokenCache.TOKEN_TYPES[type_value] for type_value in entry_types]
+        return [
+            Token(token_types[text_index], string_table[text_index], offset)
+            for offset, text_index in zip(offsets, text_indexes)
+        ]
+
+    def _cache_entries(self) -> List[Tuple[float, int, str]]:
+        entries = []
+        try:
+            with os.scandir(self._cache_dir) as scanner:
+                for entry in scanner:
+                    if entry.name.endswith(TokenCache.SUFFIX) and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _scan_total_bytes(self) -> int:
+        # Only done once per instance; later saves keep a running total.
+        return sum(size for _, size, _ in self._cache_entries())
+
+    def _evict(self):
+        # Evict down to a fraction of the limit so that the directory is not
+        # walked again on the very next save.
+        entries = sorted(self._cache_entries())
+        total_size = sum(size for _, size, _ in entries)
+        target_size = self._max_bytes * TokenCache.EVICTION_RATIO
+        for _, size, path in entries:
+            if total_size <= target_size:
+                break
+
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total_size -= size
+
+        self._total_bytes = total_size